@@ -1,11 +1,58 @@
-from flask import Flask, request, jsonify, render_template, redirect, url_for, flash
+from flask import Flask, Response, request, jsonify, render_template, redirect, url_for, flash
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.exceptions import BadRequest, HTTPException
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import raiseload
+from sqlalchemy.sql.expression import FunctionElement
 import os
+import re
+import math
+import hashlib
+import atexit
+import collections
+import logging
+import logging.handlers
+import queue
+import sys
+import stat
+import threading
+import time
 from datetime import datetime
 import click # Import click for Flask CLI commands
+import numpy as np
+import orjson
+
+try:
+    from numba import njit
+except ImportError: # Numba is optional; batch pricing falls back to plain NumPy
+    njit = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider using orjson for request parsing and response encoding.
+    
+    Datetimes are encoded natively by orjson as ISO 8601 strings, so model
+    to_dict() methods return them as-is.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            # e.g. object_hook from the session serializer, which orjson lacks
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 # IMPORTANT: Use an environment variable for SECRET_KEY in production!
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-here')
 
@@ -19,11 +66,54 @@ if database_url.startswith('postgres://'):
 
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+if database_url.startswith('postgresql'):
+    # Keep warm connections around and drop ones the server has closed
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_pre_ping': True,
+        'pool_recycle': 300
+    }
+
+# Cache compiled templates on disk so restarted workers skip recompiling them.
+# Template auto-reload is already tied to debug mode by Flask.
+def _private_cache_dir(path):
+    """Create path (mode 0700) if needed and make sure only the app user can write to it.
+    
+    Jinja executes the cached bytecode, so a directory someone else can write
+    to would let them run code as the app user.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if (not stat.S_ISDIR(st.st_mode)
+            or (hasattr(os, 'getuid') and st.st_uid != os.getuid())
+            or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)):
+        raise RuntimeError(f'JINJA_CACHE_DIR {path!r} must be a directory owned and only writable by the app user')
+    return path
+
+jinja_cache_dir = os.environ.get('JINJA_CACHE_DIR')
+# Without an explicit directory Jinja uses its own per-user, permission-checked one
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(_private_cache_dir(jinja_cache_dir) if jinja_cache_dir else None)
 
 # Initialize extensions
 db = SQLAlchemy(app)
 CORS(app) # Enable CORS for frontend communication
 
+# Database-side default for timestamp columns: naive UTC, matching
+# datetime.utcnow(), whatever the database server's TimeZone setting is
+class utcnow(FunctionElement):
+    type = db.DateTime()
+    inherit_cache = True
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kw):
+    return 'CURRENT_TIMESTAMP' # Already UTC on SQLite
+
+@compiles(utcnow, 'postgresql')
+def _compile_utcnow_postgresql(element, compiler, **kw):
+    # now() is in the session time zone; convert it to UTC wall-clock time
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
 # Database Models
 class DeliveryCoefficients(db.Model):
     __tablename__ = 'delivery_coefficients'
@@ -32,7 +122,7 @@ class DeliveryCoefficients(db.Model):
     distance_coefficient = db.Column(db.Float, nullable=False, default=0.5)
     weight_coefficient = db.Column(db.Float, nullable=False, default=0.5)
     base_cost = db.Column(db.Float, nullable=False, default=5.0)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=utcnow())
     
     def to_dict(self):
         return {
@@ -40,7 +130,7 @@ class DeliveryCoefficients(db.Model):
             'distance_coefficient': self.distance_coefficient,
             'weight_coefficient': self.weight_coefficient,
             'base_cost': self.base_cost,
-            'updated_at': self.updated_at.isoformat()
+            'updated_at': self.updated_at
         }
 
 class ContactSubmission(db.Model):
@@ -51,7 +141,10 @@ class ContactSubmission(db.Model):
     email = db.Column(db.String(120), nullable=False)
     phone = db.Column(db.String(20), nullable=True)
     message = db.Column(db.Text, nullable=False)
-    submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    submitted_at = db.Column(db.DateTime, server_default=utcnow())
+    
+    # Backs the newest-first listing on the admin dashboard
+    __table_args__ = (db.Index('ix_sub_at_desc', submitted_at.desc()),)
     
     def to_dict(self):
         return {
@@ -60,7 +153,7 @@ class ContactSubmission(db.Model):
             'email': self.email,
             'phone': self.phone,
             'message': self.message,
-            'submitted_at': self.submitted_at.isoformat()
+            'submitted_at': self.submitted_at
         }
 
 class DeliveryCalculation(db.Model):
@@ -70,7 +163,10 @@ class DeliveryCalculation(db.Model):
     distance = db.Column(db.Float, nullable=False)
     weight = db.Column(db.Float, nullable=False)
     calculated_cost = db.Column(db.Float, nullable=False)
-    calculated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    calculated_at = db.Column(db.DateTime, server_default=utcnow())
+    
+    # Backs the newest-first listing on the admin dashboard
+    __table_args__ = (db.Index('ix_calc_at_desc', calculated_at.desc()),)
     
     def to_dict(self):
         return {
@@ -78,9 +174,141 @@ class DeliveryCalculation(db.Model):
             'distance': self.distance,
             'weight': self.weight,
             'calculated_cost': self.calculated_cost,
-            'calculated_at': self.calculated_at.isoformat()
+            'calculated_at': self.calculated_at
         }
 
+# In-process cache for the singleton coefficients row. update_coefficients
+# invalidates it in the worker that handled the update; every other worker
+# (and dyno) picks the change up once its entry is older than
+# COEFFICIENTS_CACHE_TTL. The entry also holds the coefficients pre-encoded
+# as JSON for pricing responses.
+COEFFICIENTS_CACHE_TTL = 5 # seconds
+Coefficients = collections.namedtuple('Coefficients', ['base_cost', 'distance_coefficient', 'weight_coefficient'])
+_coeffs_cache = {'data': None}
+
+def get_cached_coefficients_entry():
+    """Return (Coefficients, encoded JSON bytes), or None if not configured"""
+    cached = _coeffs_cache['data']
+    now = time.monotonic()
+    if cached is not None and now - cached[0] <= COEFFICIENTS_CACHE_TTL:
+        return cached[1]
+    # Plain column select; no ORM instance is needed for three floats
+    row = db.session.execute(
+        db.select(DeliveryCoefficients.base_cost,
+                  DeliveryCoefficients.distance_coefficient,
+                  DeliveryCoefficients.weight_coefficient)
+        .limit(1)
+    ).first()
+    if row is None:
+        return None
+    data = Coefficients(*row)
+    entry = (data, orjson.dumps(data._asdict()))
+    _coeffs_cache['data'] = (now, entry)
+    return entry
+
+def get_cached_coefficients():
+    """Return the current Coefficients tuple, or None if not configured"""
+    entry = get_cached_coefficients_entry()
+    return entry[0] if entry else None
+
+def invalidate_coefficients_cache():
+    """Drop the cached coefficients so the next read goes to the database"""
+    _coeffs_cache['data'] = None
+
+# Delivery calculations are only kept for analytics. They are always written
+# as JSON lines to stdout for the log pipeline; set SAVE_CALCULATIONS_TO_DB
+# to also keep them in the delivery_calculations table.
+SAVE_CALCULATIONS_TO_DB = os.environ.get('SAVE_CALCULATIONS_TO_DB', '').lower() in ('1', 'true', 'yes')
+
+# Records waiting for the listener thread. Bounded so that a stalled stdout,
+# or a worker forked after import (gunicorn --preload) where the listener
+# thread no longer runs, cannot grow memory without limit.
+ANALYTICS_QUEUE_SIZE = 10000
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when its bounded queue is full instead of blocking"""
+    
+    def __init__(self, queue_):
+        super().__init__(queue_)
+        self.dropped = 0
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if not self.dropped:
+                app.logger.warning('Analytics log queue is full; dropping delivery calculation records')
+            self.dropped += 1
+
+# The analytics logger only enqueues records; a listener thread does the I/O
+analytics_logger = logging.getLogger('jwfoods.analytics')
+analytics_logger.setLevel(logging.INFO)
+analytics_logger.propagate = False
+_analytics_queue = queue.Queue(maxsize=ANALYTICS_QUEUE_SIZE)
+analytics_handler = DroppingQueueHandler(_analytics_queue)
+analytics_logger.addHandler(analytics_handler)
+_analytics_stream = logging.StreamHandler(sys.stdout)
+_analytics_stream.setFormatter(logging.Formatter('%(message)s'))
+_analytics_listener = logging.handlers.QueueListener(_analytics_queue, _analytics_stream)
+_analytics_listener.start()
+
+def _stop_analytics_listener():
+    """Flush queued analytics records on shutdown"""
+    try:
+        _analytics_listener.stop()
+    except queue.Full:
+        pass # Listener is stalled or gone; the queued records are dropped
+
+atexit.register(_stop_analytics_listener)
+
+# When saved to the database, calculations are buffered in memory and
+# written in batches by a background thread instead of committing once
+# per request.
+CALC_FLUSH_INTERVAL = 0.5 # seconds
+CALC_FLUSH_SIZE = 100
+_calc_buffer = collections.deque()
+_calc_flush_event = threading.Event()
+
+def record_calculations(rows):
+    """Record delivery calculations (dicts of distance, weight, calculated_cost) for analytics"""
+    calculated_at = time.time()
+    for row in rows:
+        analytics_logger.info(orjson.dumps({
+            'event': 'delivery_calculation',
+            'calculated_at': calculated_at,
+            **row
+        }).decode())
+    if SAVE_CALCULATIONS_TO_DB:
+        _calc_buffer.extend(rows)
+        if len(_calc_buffer) >= CALC_FLUSH_SIZE:
+            _calc_flush_event.set()
+
+def flush_calculations():
+    """Write all buffered delivery calculations to the database in one batch"""
+    rows = []
+    while _calc_buffer:
+        rows.append(_calc_buffer.popleft())
+    if not rows:
+        return
+    with app.app_context():
+        try:
+            db.session.bulk_insert_mappings(DeliveryCalculation, rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"Failed to save {len(rows)} delivery calculations: {e}")
+
+def _calculation_writer():
+    """Background loop flushing the calculation buffer periodically or when it fills up"""
+    while True:
+        _calc_flush_event.wait(CALC_FLUSH_INTERVAL)
+        _calc_flush_event.clear()
+        flush_calculations()
+
+if SAVE_CALCULATIONS_TO_DB:
+    threading.Thread(target=_calculation_writer, name='calculation-writer', daemon=True).start()
+    atexit.register(flush_calculations) # Drain whatever is left on shutdown
+
 # Flask CLI command for database initialization
 @app.cli.command('init-db')
 def init_db_command():
@@ -90,7 +318,10 @@ def init_db_command():
         db.create_all() # Create all tables
         
         # Check if coefficients exist, if not create default ones
-        if not DeliveryCoefficients.query.first():
+        coeffs_exist = db.session.execute(
+            db.select(db.literal(1)).select_from(DeliveryCoefficients).limit(1)
+        ).scalar() is not None
+        if not coeffs_exist:
             default_coeffs = DeliveryCoefficients(
                 distance_coefficient=0.5,
                 weight_coefficient=0.5,
@@ -103,119 +334,313 @@ def init_db_command():
             click.echo('Database already initialized with coefficients. Skipping default insertion.')
     click.echo('Database initialized successfully.')
 
+@app.cli.command('create-indexes')
+def create_indexes_command():
+    """Create any missing indexes on an existing database without touching its data."""
+    with app.app_context():
+        # CREATE INDEX CONCURRENTLY avoids locking writes on PostgreSQL but
+        # cannot run inside a transaction, hence the autocommit connection
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            concurrently = conn.dialect.name == 'postgresql'
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.dialect_options['postgresql']['concurrently'] = concurrently
+                    index.create(conn, checkfirst=True)
+                    click.echo(f'Ensured index {index.name} on {table.name}.')
+    click.echo('Indexes created successfully.')
+
+@app.cli.command('sync-defaults')
+def sync_defaults_command():
+    """Apply the models' server-side column defaults to an existing database."""
+    with app.app_context():
+        if db.engine.dialect.name != 'postgresql':
+            # SQLite cannot alter column defaults in place
+            click.echo('Column defaults can only be updated in place on PostgreSQL. Run init-db instead.')
+            return
+        with db.engine.begin() as conn:
+            preparer = conn.dialect.identifier_preparer
+            for table in db.metadata.sorted_tables:
+                for column in table.columns:
+                    if column.server_default is None:
+                        continue
+                    default = column.server_default.arg.compile(dialect=conn.dialect)
+                    conn.execute(db.text(
+                        f'ALTER TABLE {preparer.format_table(table)} '
+                        f'ALTER COLUMN {preparer.quote(column.name)} SET DEFAULT {default}'
+                    ))
+                    click.echo(f'Set default for {table.name}.{column.name}.')
+    click.echo('Column defaults updated successfully.')
+
+
+# Error handling for the JSON API. Unhandled exceptions reach this as a 500
+# InternalServerError after Flask has logged them.
+@app.errorhandler(HTTPException)
+def handle_http_error(e):
+    """Return API errors as JSON; other errors keep Flask's default pages"""
+    if not request.path.startswith('/api/'):
+        return e
+    return jsonify({'error': e.description}), e.code
 
 # API Routes
+
+# Fixed shape of the calculate_delivery response, filled with % formatting
+# instead of building and encoding a dict. %r is the shortest round-trip
+# repr of the validated int/float inputs, which is also valid JSON.
+PRICING_RESPONSE = b'{"success":true,"cost":%.2f,"distance":%r,"weight":%r,"coefficients_used":%s}'
+
+def _is_number(value):
+    """True for JSON numbers; bools are excluded even though they are ints in Python"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
 @app.route('/api/calculate-delivery', methods=['POST'])
 def calculate_delivery():
     """Calculate delivery cost based on distance and weight"""
-    try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-        
-        distance = data.get('distance')
-        weight = data.get('weight')
-        
-        if distance is None or weight is None:
-            return jsonify({'error': 'Distance and weight are required'}), 400
-        
-        if distance <= 0 or weight <= 0:
-            return jsonify({'error': 'Distance and weight must be positive values'}), 400
-        
-        # Get current coefficients from database
-        coeffs = DeliveryCoefficients.query.first()
-        if not coeffs:
-            # If coefficients are not found, it means the database wasn't initialized
-            return jsonify({'error': 'Delivery coefficients not configured. Please initialize the database.'}), 500
-        
-        # Calculate delivery cost
-        calculated_cost = (coeffs.base_cost + 
-                           (coeffs.distance_coefficient * distance) + 
-                           (coeffs.weight_coefficient * weight))
-        
-        # Round to 2 decimal places
-        calculated_cost = round(calculated_cost, 2)
-        
-        # Save calculation to database for analytics
-        calculation = DeliveryCalculation(
-            distance=distance,
-            weight=weight,
-            calculated_cost=calculated_cost
-        )
-        db.session.add(calculation)
-        db.session.commit()
-        
-        return jsonify({
-            'success': True,
-            'cost': calculated_cost,
-            'distance': distance,
-            'weight': weight,
-            'coefficients_used': {
-                'distance_coefficient': coeffs.distance_coefficient,
-                'weight_coefficient': coeffs.weight_coefficient,
-                'base_cost': coeffs.base_cost
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({'error': f'Calculation failed: {str(e)}'}), 500
+    data = request.get_json()
+    
+    if not isinstance(data, dict) or not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    distance = data.get('distance')
+    weight = data.get('weight')
+    
+    if distance is None or weight is None:
+        return jsonify({'error': 'Distance and weight are required'}), 400
+    
+    if not (_is_number(distance) and _is_number(weight)):
+        return jsonify({'error': 'Distance and weight must be numeric'}), 400
+    
+    if distance <= 0 or weight <= 0:
+        return jsonify({'error': 'Distance and weight must be positive values'}), 400
+    
+    # Get current coefficients (cached in-process, refreshed on admin update)
+    entry = get_cached_coefficients_entry()
+    if not entry:
+        # If coefficients are not found, it means the database wasn't initialized
+        return jsonify({'error': 'Delivery coefficients not configured. Please initialize the database.'}), 500
+    coeffs, coeffs_json = entry
+    base_cost, distance_coefficient, weight_coefficient = coeffs
+    
+    # Calculate delivery cost
+    calculated_cost = (base_cost + 
+                       (distance_coefficient * distance) + 
+                       (weight_coefficient * weight))
+    
+    # Round to 2 decimal places
+    calculated_cost = round(calculated_cost, 2)
+    if not math.isfinite(calculated_cost):
+        return jsonify({'error': 'Distance and weight are too large'}), 400
+    
+    # Record calculation for analytics (off the request's critical path)
+    record_calculations([{
+        'distance': distance,
+        'weight': weight,
+        'calculated_cost': calculated_cost
+    }])
+    
+    # The coefficients part of the response is already encoded
+    return Response(
+        PRICING_RESPONSE % (calculated_cost, distance, weight, coeffs_json),
+        mimetype='application/json'
+    )
+
+# Upper bound on shipments priced in a single batch request
+MAX_BATCH_SIZE = 1000
+
+def price_shipments(distances, weights, coeffs):
+    """Unrounded delivery costs for float64 arrays of distances and weights"""
+    base_cost, distance_coefficient, weight_coefficient = coeffs
+    # Overflow to inf is caught by the caller's finiteness check
+    with np.errstate(over='ignore'):
+        return base_cost + distance_coefficient * distances + weight_coefficient * weights
+
+if njit is not None:
+    @njit(cache=True)
+    def _price_kernel(distances, weights, base_cost, distance_coefficient, weight_coefficient, out):
+        for i in range(distances.shape[0]):
+            out[i] = base_cost + distance_coefficient * distances[i] + weight_coefficient * weights[i]
+    
+    def price_shipments(distances, weights, coeffs):
+        """Unrounded delivery costs for float64 arrays of distances and weights"""
+        out = np.empty_like(distances)
+        _price_kernel(distances, weights, *coeffs, out)
+        return out
+    
+    # Compile (or load from Numba's on-disk cache) now rather than on the first request
+    price_shipments(np.ones(1), np.ones(1), Coefficients(0.0, 0.0, 0.0))
+
+@app.route('/api/calculate-delivery-batch', methods=['POST'])
+def calculate_delivery_batch():
+    """Calculate delivery costs for many shipments in one request"""
+    data = request.get_json()
+    
+    if not isinstance(data, dict) or not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    distances = data.get('distances')
+    weights = data.get('weights')
+    
+    if not isinstance(distances, list) or not isinstance(weights, list):
+        return jsonify({'error': 'Distances and weights lists are required'}), 400
+    
+    if len(distances) != len(weights):
+        return jsonify({'error': 'Distances and weights must have the same length'}), 400
+    
+    if not distances or len(distances) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'Batch must contain between 1 and {MAX_BATCH_SIZE} shipments'}), 400
+    
+    # Same element check as calculate_delivery, so np.asarray never coerces
+    # bools, numeric strings or nested lists
+    if not (all(map(_is_number, distances)) and all(map(_is_number, weights))):
+        return jsonify({'error': 'Distances and weights must be numeric'}), 400
+    
+    distances = np.asarray(distances, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    
+    if not ((distances > 0).all() and (weights > 0).all()):
+        return jsonify({'error': 'Distance and weight must be positive values'}), 400
+    
+    coeffs = get_cached_coefficients()
+    if not coeffs:
+        return jsonify({'error': 'Delivery coefficients not configured. Please initialize the database.'}), 500
+    base_cost, distance_coefficient, weight_coefficient = coeffs
+    
+    # Same formula as calculate_delivery, evaluated over the whole batch
+    costs = price_shipments(distances, weights, coeffs)
+    if not np.isfinite(costs).all():
+        return jsonify({'error': 'Distance and weight are too large'}), 400
+    
+    # Round with Python's round(), like calculate_delivery; np.round scales
+    # by 100 first and can land on a different cent
+    costs = [round(c, 2) for c in costs.tolist()]
+    distances = distances.tolist()
+    weights = weights.tolist()
+    
+    # Record calculations for analytics (off the request's critical path)
+    record_calculations([
+        {'distance': d, 'weight': w, 'calculated_cost': c}
+        for d, w, c in zip(distances, weights, costs)
+    ])
+    
+    return jsonify({
+        'success': True,
+        'costs': costs,
+        'coefficients_used': {
+            'distance_coefficient': distance_coefficient,
+            'weight_coefficient': weight_coefficient,
+            'base_cost': base_cost
+        }
+    })
+
+# Contact form limits: payload size before parsing, then per-field lengths
+# matching the ContactSubmission columns
+MAX_CONTACT_PAYLOAD = 10 * 1024 # bytes
+MAX_EMAIL_LENGTH = 120
+# Longer values are truncated; the email is never truncated and is rejected instead
+CONTACT_FIELDS = (('name', 100), ('email', None), ('phone', 20), ('message', 5000))
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$').match
 
 @app.route('/api/contact', methods=['POST'])
 def submit_contact():
     """Handle contact form submissions"""
+    if request.content_length is not None and request.content_length > MAX_CONTACT_PAYLOAD:
+        return jsonify({'error': 'Contact form submission is too large'}), 413
+    
+    if not request.is_json:
+        request.on_json_loading_failed(None) # Same 415 as get_json()
+    
+    # Read at most one byte past the cap, so chunked bodies without a
+    # Content-Length header are bounded as well
+    body = request.stream.read(MAX_CONTACT_PAYLOAD + 1)
+    if len(body) > MAX_CONTACT_PAYLOAD:
+        return jsonify({'error': 'Contact form submission is too large'}), 413
+    
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-        
-        name = data.get('name', '').strip()
-        email = data.get('email', '').strip()
-        phone = data.get('phone', '').strip()
-        message = data.get('message', '').strip()
-        
-        if not name or not email or not message:
-            return jsonify({'error': 'Name, email, and message are required'}), 400
-        
-        # Basic email validation
-        if '@' not in email or '.' not in email:
-            return jsonify({'error': 'Please provide a valid email address'}), 400
-        
-        # Save contact submission
-        submission = ContactSubmission(
-            name=name,
-            email=email,
-            phone=phone if phone else None,
-            message=message
-        )
-        db.session.add(submission)
-        db.session.commit()
-        
-        return jsonify({
-            'success': True,
-            'message': 'Thank you for your message! We\'ll get back to you soon.',
-            'submission_id': submission.id
-        })
-        
-    except Exception as e:
-        return jsonify({'error': f'Failed to submit contact form: {str(e)}'}), 500
+        data = app.json.loads(body)
+    except ValueError as e:
+        request.on_json_loading_failed(e) # Same 400 as get_json()
+    
+    if not isinstance(data, dict) or not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    if not all(isinstance(data.get(key, ''), str) for key, _ in CONTACT_FIELDS):
+        return jsonify({'error': 'Name, email, phone, and message must be text'}), 400
+    
+    name, email, phone, message = (data.get(key, '').strip()[:limit] for key, limit in CONTACT_FIELDS)
+    
+    if not name or not email or not message:
+        return jsonify({'error': 'Name, email, and message are required'}), 400
+    
+    # Basic email validation
+    if len(email) > MAX_EMAIL_LENGTH or not _EMAIL_RE(email):
+        return jsonify({'error': 'Please provide a valid email address'}), 400
+    
+    # Save contact submission; RETURNING hands back the id in the same round trip
+    submission_id = db.session.execute(
+        db.insert(ContactSubmission)
+        .values(name=name, email=email, phone=phone if phone else None, message=message)
+        .returning(ContactSubmission.id)
+    ).scalar_one()
+    db.session.commit()
+    
+    return jsonify({
+        'success': True,
+        'message': 'Thank you for your message! We\'ll get back to you soon.',
+        'submission_id': submission_id
+    })
 
 @app.route('/api/coefficients', methods=['GET'])
 def get_coefficients():
     """Get current delivery coefficients"""
-    try:
-        coeffs = DeliveryCoefficients.query.first()
-        if not coeffs:
-            return jsonify({'error': 'No coefficients found. Please initialize the database.'}), 404
-        
-        return jsonify({
-            'success': True,
-            'coefficients': coeffs.to_dict()
-        })
-        
-    except Exception as e:
-        return jsonify({'error': f'Failed to get coefficients: {str(e)}'}), 500
+    coeffs = DeliveryCoefficients.query.first()
+    if not coeffs:
+        return jsonify({'error': 'No coefficients found. Please initialize the database.'}), 404
+    
+    return jsonify({
+        'success': True,
+        'coefficients': coeffs.to_dict()
+    })
+
+# Number of message characters shown in the dashboard preview (one extra so
+# the template can tell whether the message was truncated)
+MESSAGE_PREVIEW_LENGTH = 50
+
+ADMIN_PAGE_SIZE = 20
+
+class KeysetPage:
+    """One page of rows, newest first, plus the cursor for the next (older) page"""
+    
+    def __init__(self, items, last_seen_id, next_cursor):
+        self.items = items
+        self.last_seen_id = last_seen_id
+        self.next_cursor = next_cursor
+    
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+    
+    def __iter__(self):
+        return iter(self.items)
+    
+    def __bool__(self):
+        return bool(self.items)
+
+def keyset_paginate(model, order_column, last_seen_id=None, per_page=ADMIN_PAGE_SIZE):
+    """Fetch rows older than the last_seen_id row, newest first, without issuing a COUNT query.
+    
+    Rows are ordered by (order_column, id) descending; id breaks timestamp ties.
+    """
+    query = model.query.options(raiseload('*')).order_by(order_column.desc(), model.id.desc())
+    if last_seen_id is not None:
+        last_seen_at = db.select(order_column).where(model.id == last_seen_id).scalar_subquery()
+        query = query.filter(db.or_(
+            order_column < last_seen_at,
+            db.and_(order_column == last_seen_at, model.id < last_seen_id)
+        ))
+    # One extra row tells us whether there is another page
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = items[-1].id if len(rows) > per_page else None
+    return KeysetPage(items, last_seen_id, next_cursor)
 
 # Admin Routes
 @app.route('/admin')
@@ -223,9 +648,27 @@ def admin_dashboard():
     """Admin dashboard"""
     # Ensure database is accessible and tables exist before querying
     try:
-        coeffs = DeliveryCoefficients.query.first()
-        recent_calculations = DeliveryCalculation.query.order_by(DeliveryCalculation.calculated_at.desc()).limit(10).all()
-        recent_contacts = ContactSubmission.query.order_by(ContactSubmission.submitted_at.desc()).limit(10).all()
+        coeffs = get_cached_coefficients()
+        # Select only the columns the dashboard shows, as plain rows
+        recent_calculations = db.session.execute(
+            db.select(DeliveryCalculation.id,
+                      DeliveryCalculation.distance,
+                      DeliveryCalculation.weight,
+                      DeliveryCalculation.calculated_cost,
+                      DeliveryCalculation.calculated_at)
+            .order_by(DeliveryCalculation.calculated_at.desc())
+            .limit(10)
+        ).all()
+        recent_contacts = db.session.execute(
+            db.select(ContactSubmission.id,
+                      ContactSubmission.name,
+                      ContactSubmission.email,
+                      ContactSubmission.phone,
+                      db.func.substr(ContactSubmission.message, 1, MESSAGE_PREVIEW_LENGTH + 1).label('message'),
+                      ContactSubmission.submitted_at)
+            .order_by(ContactSubmission.submitted_at.desc())
+            .limit(10)
+        ).all()
     except Exception as e:
         # Log the error for debugging
         app.logger.error(f"Database query error in admin_dashboard: {e}")
@@ -239,24 +682,39 @@ def admin_dashboard():
                            calculations=recent_calculations,
                            contacts=recent_contacts)
 
+def _parse_positive_floats(form, *, invalid_message='Please enter valid numeric values',
+                           negative_message='All values must be positive', **defaults):
+    """Parse the named form fields as floats, in order, using the defaults for missing ones.
+    
+    Raises BadRequest with invalid_message if a value is not a finite number,
+    or with negative_message if it is negative.
+    """
+    values = form.to_dict(flat=True)
+    try:
+        parsed = tuple(float(values.get(key, default)) for key, default in defaults.items())
+    except ValueError:
+        raise BadRequest(invalid_message)
+    if not all(math.isfinite(v) for v in parsed):
+        raise BadRequest(invalid_message)
+    if any(v < 0 for v in parsed):
+        raise BadRequest(negative_message)
+    return parsed
+
 @app.route('/admin/update-coefficients', methods=['POST'])
 def update_coefficients():
     """Update delivery coefficients"""
     try:
-        distance_coeff = float(request.form.get('distance_coefficient', 0.5))
-        weight_coeff = float(request.form.get('weight_coefficient', 0.5))
-        base_cost = float(request.form.get('base_cost', 5.0))
-        
-        if distance_coeff < 0 or weight_coeff < 0 or base_cost < 0:
-            flash('All coefficients must be positive values', 'error')
-            return redirect(url_for('admin_dashboard'))
+        distance_coeff, weight_coeff, base_cost = _parse_positive_floats(
+            request.form,
+            negative_message='All coefficients must be positive values',
+            distance_coefficient=0.5, weight_coefficient=0.5, base_cost=5.0
+        )
         
         coeffs = DeliveryCoefficients.query.first()
         if coeffs:
             coeffs.distance_coefficient = distance_coeff
             coeffs.weight_coefficient = weight_coeff
             coeffs.base_cost = base_cost
-            coeffs.updated_at = datetime.utcnow()
         else:
             # This case should ideally not happen if init-db is run, but handles it gracefully
             coeffs = DeliveryCoefficients(
@@ -267,10 +725,11 @@ def update_coefficients():
             db.session.add(coeffs)
         
         db.session.commit()
+        invalidate_coefficients_cache()
         flash('Coefficients updated successfully!', 'success')
         
-    except ValueError:
-        flash('Please enter valid numeric values', 'error')
+    except BadRequest as e:
+        flash(e.description, 'error')
     except Exception as e:
         flash(f'Error updating coefficients: {str(e)}', 'error')
     
@@ -280,51 +739,71 @@ def update_coefficients():
 def admin_calculations():
     """View all delivery calculations"""
     try:
-        page = request.args.get('page', 1, type=int)
-        calculations = DeliveryCalculation.query.order_by(DeliveryCalculation.calculated_at.desc()).paginate(
-            page=page, per_page=20, error_out=False
-        )
+        last_seen_id = request.args.get('last_seen_id', type=int)
+        calculations = keyset_paginate(DeliveryCalculation, DeliveryCalculation.calculated_at, last_seen_id)
     except Exception as e:
         app.logger.error(f"Database query error in admin_calculations: {e}")
         flash(f"Error loading calculations data: {e}. Please ensure the database is initialized.", 'danger')
-        calculations = None # Or an empty Pagination object if preferred
+        calculations = None
     return render_template('calculations.html', calculations=calculations)
 
 @app.route('/admin/contacts')
 def admin_contacts():
     """View all contact submissions"""
     try:
-        page = request.args.get('page', 1, type=int)
-        contacts = ContactSubmission.query.order_by(ContactSubmission.submitted_at.desc()).paginate(
-            page=page, per_page=20, error_out=False
-        )
+        last_seen_id = request.args.get('last_seen_id', type=int)
+        contacts = keyset_paginate(ContactSubmission, ContactSubmission.submitted_at, last_seen_id)
     except Exception as e:
         app.logger.error(f"Database query error in admin_contacts: {e}")
         flash(f"Error loading contacts data: {e}. Please ensure the database is initialized.", 'danger')
-        contacts = None # Or an empty Pagination object if preferred
+        contacts = None
     return render_template('contacts.html', contacts=contacts)
 
+# The main website has no dynamic content, so it is rendered once per process
+# (every time in debug mode) and served with caching headers
+INDEX_MAX_AGE = 3600 # seconds
+_index_page = {'data': None}
+
 # Serve the main website
 @app.route('/')
 def index():
     """Serve the main website"""
-    return render_template('index.html')
+    page = _index_page['data']
+    if page is None or app.debug:
+        html = render_template('index.html').encode()
+        page = (html, hashlib.sha1(html).hexdigest())
+        _index_page['data'] = page
+    html, etag = page
+    
+    response = Response(html, mimetype='text/html')
+    # In debug mode make the browser revalidate so template edits show up
+    response.headers['Cache-Control'] = 'no-cache' if app.debug else f'public, max-age={INDEX_MAX_AGE}'
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+# Load balancer probes can hit /health many times a second, so the database
+# check result is reused for HEALTH_CHECK_INTERVAL seconds
+HEALTH_CHECK_INTERVAL = 5 # seconds
+_health = {'checked_at': None, 'status': 'disconnected'}
 
 # Health check endpoint
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    try:
-        # Attempt a simple database query to check connection
-        db.session.execute(db.select(1)).scalar_one()
-        db_status = 'connected'
-    except Exception:
-        db_status = 'disconnected'
+    now = time.monotonic()
+    if _health['checked_at'] is None or now - _health['checked_at'] > HEALTH_CHECK_INTERVAL:
+        try:
+            # Attempt a simple database query to check connection
+            db.session.execute(db.select(1)).scalar_one()
+            _health['status'] = 'connected'
+        except Exception:
+            _health['status'] = 'disconnected'
+        _health['checked_at'] = now
 
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat(),
-        'database': db_status
+        'timestamp': datetime.utcnow(),
+        'database': _health['status']
     })
 
 if __name__ == '__main__':